@@ -26,19 +26,49 @@ HERE = os.path.abspath(os.path.dirname(__file__))
 def fmt_here(string):
     return string.format(HERE=HERE)
 
+# the compiled kernels are optional: Cython is a build requirement in
+# pyproject.toml, but if it's missing or the extension fails to compile,
+# sweatervest.util falls back to numba or NumPy
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    ext_modules = [ ]
+else:
+    ext_modules = cythonize(
+        [
+            Extension(
+                'sweatervest._fast',
+                [ 'sweatervest/_fast.pyx' ],
+                extra_compile_args=[ '-O3' ] if os.name == 'posix' else [ ],
+            ),
+        ],
+        language_level=3,
+    )
+
+    # set after cythonize, which doesn't carry it over to the extensions it
+    # returns; a failed compile then warns instead of failing the install
+    for extension in ext_modules:
+        extension.optional = True
+
 setup(
     name='sweatervest',
     version=find_version('sweatervest/__init__.py'),
     author='Stephen [Bracket] McCray',
     author_email='mcbracket@gmail.com',
     packages=['sweatervest'],
+    ext_modules=ext_modules,
+    extras_require={
+        'jit' : [ 'numba' ],
+    },
+    python_requires='>=3.8',
     classifiers=[
-        'Development Status :: 4 - Beta'
-        'Programming Language :: Python :: 2',
-        'Programming Language :: Python :: 2.6',
-        'Programming Language :: Python :: 2.7',
+        'Development Status :: 4 - Beta',
         'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.3',
-        'Programming Language :: Python :: 3.4',
+        'Programming Language :: Python :: 3 :: Only',
+        'Programming Language :: Python :: 3.8',
+        'Programming Language :: Python :: 3.9',
+        'Programming Language :: Python :: 3.10',
+        'Programming Language :: Python :: 3.11',
+        'Programming Language :: Python :: 3.12',
     ]
 )
@@ -0,0 +1,154 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, initializedcheck=False
+"""
+Optional compiled kernels for sweatervest.util.  util falls back to numba or
+NumPy when this extension isn't built.
+"""
+
+# value of each hex digit, indexed by byte; anything else maps to a sentinel
+# that overflows a decoded channel past 0xff
+cdef int hex_table[256]
+
+def _make_hex_table():
+    cdef const unsigned char *lower = b'0123456789abcdef'
+    cdef const unsigned char *upper = b'ABCDEF'
+    cdef int i
+
+    for i in range(256):
+        hex_table[i] = 0x100
+
+    for i in range(16):
+        hex_table[lower[i]] = i
+
+    for i in range(6):
+        hex_table[upper[i]] = 10 + i
+
+_make_hex_table()
+
+
+cpdef object parse_hex_color(bytes s):
+    cdef const unsigned char *b = s
+    cdef Py_ssize_t length = len(s)
+    cdef int R, G, B, A
+
+    if length > 0 and b[0] == b'#':
+        b += 1
+        length -= 1
+
+    if length == 3:
+        R, G, B, A = hex_table[b[0]] * 17, hex_table[b[1]] * 17, hex_table[b[2]] * 17, 0xff
+    elif length == 4:
+        R, G, B, A = hex_table[b[0]] * 17, hex_table[b[1]] * 17, hex_table[b[2]] * 17, hex_table[b[3]] * 17
+    elif length == 6:
+        R = (hex_table[b[0]] << 4) | hex_table[b[1]]
+        G = (hex_table[b[2]] << 4) | hex_table[b[3]]
+        B = (hex_table[b[4]] << 4) | hex_table[b[5]]
+        A = 0xff
+    elif length == 8:
+        R = (hex_table[b[0]] << 4) | hex_table[b[1]]
+        G = (hex_table[b[2]] << 4) | hex_table[b[3]]
+        B = (hex_table[b[4]] << 4) | hex_table[b[5]]
+        A = (hex_table[b[6]] << 4) | hex_table[b[7]]
+    else:
+        return None
+
+    if (R | G | B | A) > 0xff:
+        return None
+
+    return (R, G, B, A)
+
+
+# out is always C-contiguous (a fresh array or rows of the parser's shared
+# buffer), so each vertex is one contiguous 8-lane store.  Branching on the
+# dimension once, outside the row loop, leaves every store straight-line.
+
+cpdef void pad_vertices_2d(const float[:, :] input, const float[:] tail, float[:, ::1] out) noexcept nogil:
+    cdef Py_ssize_t i
+    cdef Py_ssize_t dimension = input.shape[1]
+    cdef float t0, t1, t2, t3, t4, t5
+    cdef float *o
+
+    # each branch reads the tail into locals, which the compiler knows out
+    # doesn't alias
+    if dimension == 2:
+        t0, t1, t2, t3, t4, t5 = tail[0], tail[1], tail[2], tail[3], tail[4], tail[5]
+        for i in range(input.shape[0]):
+            o = &out[i, 0]
+            o[0] = input[i, 0]
+            o[1] = input[i, 1]
+            o[2] = t0
+            o[3] = t1
+            o[4] = t2
+            o[5] = t3
+            o[6] = t4
+            o[7] = t5
+    elif dimension == 3:
+        t0, t1, t2, t3, t4 = tail[0], tail[1], tail[2], tail[3], tail[4]
+        for i in range(input.shape[0]):
+            o = &out[i, 0]
+            o[0] = input[i, 0]
+            o[1] = input[i, 1]
+            o[2] = input[i, 2]
+            o[3] = t0
+            o[4] = t1
+            o[5] = t2
+            o[6] = t3
+            o[7] = t4
+    elif dimension == 4:
+        t0, t1, t2, t3 = tail[0], tail[1], tail[2], tail[3]
+        for i in range(input.shape[0]):
+            o = &out[i, 0]
+            o[0] = input[i, 0]
+            o[1] = input[i, 1]
+            o[2] = input[i, 2]
+            o[3] = input[i, 3]
+            o[4] = t0
+            o[5] = t1
+            o[6] = t2
+            o[7] = t3
+
+
+cpdef void pad_vertices_3d(const float[:, :, :] input, const float[:] tail, float[:, :, ::1] out) noexcept nogil:
+    cdef Py_ssize_t i, j
+    cdef Py_ssize_t dimension = input.shape[2]
+    cdef float t0, t1, t2, t3, t4, t5
+    cdef float *o
+
+    if dimension == 2:
+        t0, t1, t2, t3, t4, t5 = tail[0], tail[1], tail[2], tail[3], tail[4], tail[5]
+        for i in range(input.shape[0]):
+            for j in range(input.shape[1]):
+                o = &out[i, j, 0]
+                o[0] = input[i, j, 0]
+                o[1] = input[i, j, 1]
+                o[2] = t0
+                o[3] = t1
+                o[4] = t2
+                o[5] = t3
+                o[6] = t4
+                o[7] = t5
+    elif dimension == 3:
+        t0, t1, t2, t3, t4 = tail[0], tail[1], tail[2], tail[3], tail[4]
+        for i in range(input.shape[0]):
+            for j in range(input.shape[1]):
+                o = &out[i, j, 0]
+                o[0] = input[i, j, 0]
+                o[1] = input[i, j, 1]
+                o[2] = input[i, j, 2]
+                o[3] = t0
+                o[4] = t1
+                o[5] = t2
+                o[6] = t3
+                o[7] = t4
+    elif dimension == 4:
+        t0, t1, t2, t3 = tail[0], tail[1], tail[2], tail[3]
+        for i in range(input.shape[0]):
+            for j in range(input.shape[1]):
+                o = &out[i, j, 0]
+                o[0] = input[i, j, 0]
+                o[1] = input[i, j, 1]
+                o[2] = input[i, j, 2]
+                o[3] = input[i, j, 3]
+                o[4] = t0
+                o[5] = t1
+                o[6] = t2
+                o[7] = t3
@@ -1,22 +1,57 @@
 from .parser import register_class
-from .util import color_to_float
+from .util import _color_to_f32_array, ndarray_to_jsonable
 import numpy as np
 
 default_position = (0, 0, 1, 1)
 
-def convert_position(position):
-    position = tuple(position) + default_position[len(position):]
-    return np.array(position[:4], dtype=np.float32)
+def convert_position(position, out=None):
+    if out is None:
+        out = np.empty(shape=(4,), dtype=np.float32)
+
+    n = min(len(position), 4)
+    out[:n] = position[:n]
+    out[n:] = default_position[n:]
+    return out
 
 
 @register_class
-class Circle(object):
+class Circle:
+    __slots__ = ('data', 'batch', 'index')
+
     def __init__(self, data):
-        self.center = convert_position(data['center'])
-        self.radius = data['radius']
-        self.color = np.array(color_to_float(data.get('color')), dtype=np.float32)
+        for key in ('center', 'radius'):
+            if key not in data:
+                raise KeyError(key)
+
         self.data = data
 
+        # row of this circle in its CircleBatch, assigned by
+        # CircleBatch.finalize
+        self.batch = None
+        self.index = None
+
+
+    def get_batch(self):
+        if self.batch is None:
+            CircleBatch([ self ]).finalize()
+
+        return self.batch
+
+
+    @property
+    def center(self):
+        return self.get_batch().centers[self.index]
+
+
+    @property
+    def radius(self):
+        return self.data['radius']
+
+
+    @property
+    def color(self):
+        return self.get_batch().colors[self.index]
+
 
     @classmethod
     def convert_to_object(cls, data):
@@ -26,7 +61,50 @@ class Circle(object):
     def convert_to_dict(self):
         return {
             '__class__' : 'Circle',
-            'color' : self.color.tolist(),
-            'center' : self.center.tolist(),
+            'color' : ndarray_to_jsonable(self.color),
+            'center' : ndarray_to_jsonable(self.center),
             'radius' : self.radius,
         }
+
+
+class CircleBatch:
+    """
+    Structure-of-arrays storage for a set of circles: float32 centers (N, 4),
+    radii (N,) and colors (N, 4).  Once finalized, each circle's center and
+    color are views into its row; radii is a float32 copy of each circle's
+    radius, which stays as given in its data.
+    """
+
+    __slots__ = ('circles', 'centers', 'radii', 'colors')
+
+    def __init__(self, circles):
+        self.circles = list(circles)
+
+        self.centers = None
+        self.radii = None
+        self.colors = None
+
+
+    def finalize(self):
+        count = len(self.circles)
+
+        self.centers = np.empty(shape=(count, 4), dtype=np.float32)
+        self.radii = np.empty(shape=(count,), dtype=np.float32)
+        self.colors = np.empty(shape=(count, 4), dtype=np.float32)
+
+        for index, circle in enumerate(self.circles):
+            if circle.batch is None:
+                convert_position(circle.data['center'], self.centers[index])
+                self.colors[index] = _color_to_f32_array(circle.data.get('color'))
+            else:
+                # carry over any edits made through the previous batch
+                self.centers[index] = circle.center
+                self.colors[index] = circle.color
+
+            self.radii[index] = circle.radius
+
+        for index, circle in enumerate(self.circles):
+            circle.batch = self
+            circle.index = index
+
+        return self
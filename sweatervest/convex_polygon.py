@@ -1,15 +1,15 @@
 from .parser import register_class
-from .util import reshape_vertices
-
-import numpy as np
+from .util import _vertices_to_f32, ndarray_to_jsonable, reshape_vertices
 
 
 @register_class
-class ConvexPolygon(object):
+class ConvexPolygon:
+    __slots__ = ('data', 'vertices')
+
     def __init__(self, data):
         self.data = data
 
-        vertices = np.array(data['vertices'], dtype=np.float32)
+        vertices = _vertices_to_f32(data['vertices'])
         self.vertices = reshape_vertices(vertices, data.get('color'))
 
 
@@ -21,5 +21,5 @@ class ConvexPolygon(object):
     def convert_to_dict(self):
         return {
             '__class__' : 'ConvexPolygon',
-            'vertices'  : self.vertices.tolist(),
+            'vertices'  : ndarray_to_jsonable(self.vertices),
         }
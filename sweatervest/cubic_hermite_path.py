@@ -1,14 +1,14 @@
 from .parser import register_class
-from .util import reshape_vertices
-
-import numpy as np
+from .util import _vertices_to_f32, ndarray_to_jsonable, reshape_vertices
 
 @register_class
-class CubicHermitePath(object):
+class CubicHermitePath:
+    __slots__ = ('data', 'vertices')
+
     def __init__(self, data):
         self.data = data
 
-        vertices = np.array(data['vertices'], dtype=np.float32)
+        vertices = _vertices_to_f32(data['vertices'])
         self.vertices = reshape_vertices(vertices, data.get('color'))
 
 
@@ -20,5 +20,5 @@ class CubicHermitePath(object):
     def convert_to_dict(self):
         return {
             '__class__' : 'CubicHermitePath',
-            'vertices'  : self.vertices.tolist(),
+            'vertices'  : ndarray_to_jsonable(self.vertices),
         }
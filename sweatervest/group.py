@@ -1,9 +1,12 @@
 from .parser import register_class
+from .util import ndarray_to_jsonable
 import numpy as np
 
 
 @register_class
-class Group(object):
+class Group:
+    __slots__ = ('data', 'xform', 'children')
+
     def __init__(self, data):
         self.data = data
 
@@ -12,7 +15,7 @@ class Group(object):
         if xform is None:
             self.xform = None
         else:
-            self.xform = np.array(xform, dtype=np.float32)
+            self.xform = np.asarray(xform, dtype=np.float32)
 
         self.children = data['children']
 
@@ -26,7 +29,7 @@ class Group(object):
         out = { "__class__" : "Group", }
 
         if self.xform is not None:
-            out['transformation'] = self.xform.tolist()
+            out['transformation'] = ndarray_to_jsonable(self.xform)
 
         out['children'] = [ child.convert_to_dict() for child in self.children ]
 
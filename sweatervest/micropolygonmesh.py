@@ -1,17 +1,14 @@
 from .parser import register_class
-from .util import reshape_vertices
-
-import numpy as np
+from .util import _vertices_to_f32, ndarray_to_jsonable, reshape_vertices
 
 @register_class
-class MicropolygonMesh(object):
+class MicropolygonMesh:
+    __slots__ = ('data', 'vertices')
+
     def __init__(self, data):
         self.data = data
 
-        vertices = np.array(
-            data['vertices'],
-            dtype=np.float32,
-        )
+        vertices = _vertices_to_f32(data['vertices'])
 
         self.vertices = reshape_vertices(vertices, data.get('color'))
 
@@ -24,7 +21,7 @@ class MicropolygonMesh(object):
     def convert_to_dict(self):
         out = {
             '__class__' : 'MicropolygonMesh',
-            'vertices'  : self.vertices.tolist(),
+            'vertices'  : ndarray_to_jsonable(self.vertices),
         }
 
         return out
@@ -1,3 +1,8 @@
+from .util import _VALID_DIMENSIONS, _color_key, _vertices_to_f32, jsonable_to_ndarray, reshape_vertices
+
+from math import prod
+
+import numpy as np
 import yaml
 
 __all__ = [
@@ -9,11 +14,99 @@ __all__ = [
 
 def parse_scene(file_or_path):
     yl = parse_scene_yaml(file_or_path)
+    batch_vertices(yl)
     return convert_to_object(yl)
 
 
+def batch_vertices(parsed):
+    """
+    Pad the vertices of every primitive in a parsed scene into one shared
+    (N, 8) float32 buffer, with one reshape_vertices call per bucket of
+    primitives sharing a class, vertex shape and color. Each primitive's
+    vertices are replaced with a view of its rows in the buffer, which is
+    returned. Anything that can't be batched is left for the primitive's own
+    constructor to convert (or reject).
+    """
+
+    buckets = { }
+
+    for item in iter_vertex_items(parsed):
+        raw = item['vertices']
+
+        try:
+            if isinstance(raw, dict):
+                raw = jsonable_to_ndarray(raw)
+
+            vertices = _vertices_to_f32(raw)
+        except (KeyError, TypeError, ValueError):
+            continue
+
+        if vertices.ndim not in (2, 3) or vertices.shape[-1] not in _VALID_DIMENSIONS:
+            continue
+
+        color = item.get('color')
+        key = (item['__class__'], vertices.shape[1:], _color_key(color))
+
+        try:
+            _, bucket = buckets.setdefault(key, (color, [ ]))
+        except TypeError:
+            continue
+
+        bucket.append((item, vertices))
+
+    rows = sum(
+        vertices.size // vertices.shape[-1]
+        for _, bucket in buckets.values()
+        for _, vertices in bucket
+    )
+
+    buffer = np.empty(shape=(rows, 8), dtype=np.float32)
+
+    start = 0
+    for color, bucket in buckets.values():
+        _, vertices = bucket[0]
+        inner, dimension = vertices.shape[1:-1], vertices.shape[-1]
+
+        count = sum(len(vertices) for _, vertices in bucket)
+        stop = start + count * prod(inner)
+
+        # the bucket's rows double as staging: each primitive's input is
+        # copied into their leading lanes, then the bucket is padded in place
+        region = buffer[start:stop].reshape((count,) + inner + (8,))
+
+        offset = 0
+        for item, vertices in bucket:
+            end = offset + len(vertices)
+            region[offset:end, ..., :dimension] = vertices
+            item['vertices'] = region[offset:end]
+            offset = end
+
+        if dimension < 8:
+            reshape_vertices(region[..., :dimension], color, out=region)
+
+        start = stop
+
+    return buffer
+
+
+def iter_vertex_items(parsed):
+    if isinstance(parsed, dict):
+        if parsed.get('__class__', None) in parser_classes and 'vertices' in parsed:
+            yield parsed
+            return
+
+        for value in parsed.values():
+            yield from iter_vertex_items(value)
+    elif isinstance(parsed, (tuple, list)):
+        for value in parsed:
+            yield from iter_vertex_items(value)
+
+
 def convert_to_object(parsed):
     if isinstance(parsed, dict):
+        if '__bytes__' in parsed:
+            return jsonable_to_ndarray(parsed)
+
         parsed = { key : convert_to_object(value) for key, value in parsed.items() }
 
         cls = parser_classes.get(parsed.get('__class__', None), None)
@@ -31,9 +124,9 @@ def convert_to_object(parsed):
 def parse_scene_yaml(file_or_path):
     if isinstance(file_or_path, str):
         with open(file_or_path) as fd:
-            return yaml.load(fd)
+            return yaml.safe_load(fd)
     else:
-        return yaml.load(file_or_path)
+        return yaml.safe_load(file_or_path)
 
 
 def register_class(cls):
@@ -1,9 +1,24 @@
-from .parser import register_class
+from .circle import Circle, CircleBatch
+from .parser import parser_classes, register_class
+
+import numpy as np
 
 @register_class
-class Scene(object):
+class Scene:
+    __slots__ = ('data', 'vertex_buffer', 'ranges', 'circles')
+
     def __init__(self, data):
         self.data = data
+
+        objects = list({ id(o) : o for o in iter_objects(data) }.values())
+
+        self.vertex_buffer, self.ranges = consolidate_vertices(
+            o for o in objects if hasattr(o, 'vertices')
+        )
+
+        self.circles = CircleBatch(
+            o for o in objects if isinstance(o, Circle)
+        ).finalize()
     
     @classmethod
     def convert_to_object(cls, data):
@@ -17,3 +32,104 @@ class Scene(object):
         }
 
         return out
+
+
+def consolidate_vertices(primitives):
+    """
+    Gather the vertices of every primitive into one contiguous (N, 8) float32
+    buffer, replacing each primitive's vertices with a view into it.  Returns
+    the buffer and a dict mapping each primitive to its (start, stop) row
+    range in the buffer.
+
+    If, as after parse_scene, the vertices already tile a single such buffer
+    it's adopted as is; otherwise they're copied into a new one.
+    """
+
+    primitives = list(primitives)
+
+    shared = shared_ranges(primitives)
+    if shared is not None:
+        return shared
+
+    rows = [ p.vertices.size // 8 for p in primitives ]
+
+    buffer = np.empty(shape=(sum(rows), 8), dtype=np.float32, order='C')
+    ranges = { }
+
+    start = 0
+    for primitive, count in zip(primitives, rows):
+        stop = start + count
+
+        vertices = buffer[start:stop].reshape(primitive.vertices.shape)
+        vertices[...] = primitive.vertices
+
+        # rebind data too, so the primitive's original copy can be freed
+        primitive.vertices = vertices
+        if isinstance(primitive.data, dict) and 'vertices' in primitive.data:
+            primitive.data['vertices'] = vertices
+
+        ranges[primitive] = (start, stop)
+
+        start = stop
+
+    return buffer, ranges
+
+
+def shared_ranges(primitives):
+    """
+    If the primitives' vertices are non-overlapping views that together
+    cover one C-contiguous (N, 8) float32 array, return that array and each
+    primitive's (start, stop) row range in it; otherwise None.
+    """
+
+    if not primitives:
+        return None
+
+    buffer = primitives[0].vertices.base
+
+    if (
+        not isinstance(buffer, np.ndarray)
+        or buffer.dtype != np.float32
+        or buffer.ndim != 2
+        or buffer.shape[1] != 8
+        or not buffer.flags.c_contiguous
+    ):
+        return None
+
+    origin = buffer.__array_interface__['data'][0]
+    row_bytes = buffer.strides[0]
+
+    ranges = { }
+    for primitive in primitives:
+        vertices = primitive.vertices
+
+        if vertices.base is not buffer or not vertices.flags.c_contiguous:
+            return None
+
+        offset = vertices.__array_interface__['data'][0] - origin
+        start = offset // row_bytes
+        ranges[primitive] = (start, start + vertices.size // 8)
+
+    spans = sorted(ranges.values())
+    if sum(stop - start for start, stop in spans) != len(buffer):
+        return None
+
+    for (_, stop), (start, _) in zip(spans, spans[1:]):
+        if start < stop:
+            return None
+
+    return buffer, ranges
+
+
+def iter_objects(node):
+    if isinstance(node, dict):
+        for value in node.values():
+            yield from iter_objects(value)
+    elif isinstance(node, (tuple, list)):
+        for value in node:
+            yield from iter_objects(value)
+    elif type(node) in parser_classes.values():
+        yield node
+
+        if not hasattr(node, 'vertices'):
+            yield from iter_objects(node.data)
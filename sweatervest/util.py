@@ -1,92 +1,338 @@
+from base64 import b64decode, b64encode
+from functools import lru_cache
+from itertools import chain
+from math import prod
+
 import numpy as np
 
-def make_color_grammar():
-    import re
+try:
+    from . import _fast
+except ImportError:
+    _fast = None
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+def make_hex_table():
+    # value of each hex digit, indexed by byte; anything else maps to a
+    # sentinel that overflows a decoded channel past 0xff
+    table = [ 0x100 ] * 256
 
-    g = { }
-    
-    g['digit']      = r'[0-9a-fA-F]'
-    g['ddigit']     = r'(?:{digit}{{2}})'.format(**g)
-    g['hex_color']  = r'^#?(?:(?P<double>{ddigit}{{3,4}})|(?P<single>{digit}{{3,4}}))$'.format(**g)
+    for i, c in enumerate(b'0123456789abcdef'):
+        table[c] = i
 
-    for key, value in g.items():
-        g[key] = re.compile(value)
+    for i, c in enumerate(b'ABCDEF', 10):
+        table[c] = i
 
-    return g
+    return table
 
-color_grammar = make_color_grammar()
+hex_table = make_hex_table()
 
+@lru_cache(maxsize=1024)
 def parse_color(string):
-    m = color_grammar['hex_color'].match(string)
+    try:
+        b = string.encode('ascii')
+    except UnicodeEncodeError:
+        return None
+
+    if _fast is not None:
+        return _fast.parse_hex_color(b)
+
+    if b[:1] == b'#':
+        b = b[1:]
+
+    t = hex_table
+    length = len(b)
+
+    if length == 3:
+        R, G, B, A = t[b[0]] * 17, t[b[1]] * 17, t[b[2]] * 17, 0xff
+    elif length == 4:
+        R, G, B, A = t[b[0]] * 17, t[b[1]] * 17, t[b[2]] * 17, t[b[3]] * 17
+    elif length == 6:
+        R = (t[b[0]] << 4) | t[b[1]]
+        G = (t[b[2]] << 4) | t[b[3]]
+        B = (t[b[4]] << 4) | t[b[5]]
+        A = 0xff
+    elif length == 8:
+        R = (t[b[0]] << 4) | t[b[1]]
+        G = (t[b[2]] << 4) | t[b[3]]
+        B = (t[b[4]] << 4) | t[b[5]]
+        A = (t[b[6]] << 4) | t[b[7]]
+    else:
+        return None
 
-    if m is None:
+    if (R | G | B | A) > 0xff:
         return None
 
-    single = m.group('single')
-    if single is not None:
-        R, G, B = single[0], single[1], single[2]
-        A = 'f' if len(single) == 3 else single[3]
-        return tuple(int(2*v, 16) for v in (R, G, B, A))
+    return (R, G, B, A)
 
-    double = m.group('double')
-    if double is not None:
-        R, G, B = double[0:2], double[2:4], double[4:6]
-        A = 'ff' if len(double) == 6 else double[6:8]
-        return tuple(int(v, 16) for v in (R, G, B, A))
+
+@lru_cache(maxsize=1024)
+def _color_to_float_str(color):
+    return tuple(c / 255. for c in parse_color(color))
 
 
 def color_to_float(color):
     if color is None:
         return (0., 0., 0., 0.)
     elif isinstance(color, str):
-        return tuple(c / 255. for c in parse_color(color))
+        return _color_to_float_str(color)
     else:
         return tuple(c / 255. if isinstance(c, int) else c for c in color)
 
 
-def reshape_vertices(input, color=None):
-    shape = list(input.shape)
+def _color_key(color):
+    """
+    Hashable key for a color such that colors sharing a key convert alike.
+    int and float components compare (and hash) equal but convert to
+    different colors, so sequences are keyed on their component types too.
+    """
 
-    if len(shape) == 2:
-        dimension = shape[1]
-        shape[1] = 8
+    if isinstance(color, (list, tuple)):
+        color = tuple(color)
+        return color, tuple(map(type, color))
 
-        slice_at = lambda x: np.s_[:,x]
-        slice_to = lambda x: np.s_[:,:x]
-        slice_from = lambda x: np.s_[:,x:]
+    return color, None
 
-    elif len(shape) == 3:
-        dimension = shape[2]
-        shape[2] = 8
 
-        slice_at = lambda x: np.s_[:,:,x]
-        slice_to = lambda x: np.s_[:,:,:x]
-        slice_from = lambda x: np.s_[:,:,x:]
-    else:
+def _read_only(array):
+    array.setflags(write=False)
+    return array
+
+
+def _make_color_arrays(color):
+    # the vertex template holds the lanes a padded vertex takes when its
+    # input doesn't supply them: z = w = 1, then the rgba color; the color
+    # array is a view of its last four lanes
+    template = np.empty(shape=(8,), dtype=np.float32)
+    template[:4] = (0, 0, 1, 1)
+    template[4:] = color
+    _read_only(template)
+
+    return template, template[4:]
+
+# shared arrays of every primitive that doesn't specify a color; matches
+# color_to_float(None)
+_DEFAULT_TEMPLATE, _DEFAULT_BLACK = _make_color_arrays(color_to_float(None))
+
+@lru_cache(maxsize=1024)
+def _cached_color_arrays(key):
+    color, _ = key
+    return _make_color_arrays(color_to_float(color))
+
+
+def _color_arrays(color):
+    # shared, read-only (vertex template, rgba) arrays for the color
+    if color is None:
+        return _DEFAULT_TEMPLATE, _DEFAULT_BLACK
+    elif isinstance(color, np.ndarray):
+        # numpy integers aren't ints to color_to_float, so this is a plain
+        # cast for every dtype
+        return _make_color_arrays(color)
+
+    return _cached_color_arrays(_color_key(color))
+
+
+def _vertex_template(color):
+    return _color_arrays(color)[0]
+
+
+def _color_to_f32_array(color):
+    return _color_arrays(color)[1]
+
+
+def ndarray_to_jsonable(arr):
+    """
+    Encode an ndarray as a dict of its dtype, shape and base64-encoded raw
+    bytes, suitable for JSON or YAML.  Inverse of jsonable_to_ndarray.
+    """
+
+    return {
+        '__dtype__' : arr.dtype.str,
+        '__shape__' : list(arr.shape),
+        '__bytes__' : b64encode(arr.tobytes()).decode('ascii'),
+    }
+
+
+def jsonable_to_ndarray(data):
+    buffer = bytearray(b64decode(data['__bytes__']))
+    return np.frombuffer(buffer, dtype=np.dtype(data['__dtype__'])).reshape(data['__shape__'])
+
+
+def _vertices_to_f32(raw):
+    if isinstance(raw, np.ndarray):
+        return np.ascontiguousarray(raw, dtype=np.float32)
+
+    # walking nested lists straight into a float32 buffer is considerably
+    # faster than np.asarray's generic sequence discovery
+    shape = _nested_shape(raw)
+
+    if shape is not None:
+        flat = raw
+        for _ in range(len(shape) - 1):
+            flat = chain.from_iterable(flat)
+
+        try:
+            return np.fromiter(flat, dtype=np.float32, count=prod(shape)).reshape(shape)
+        except (TypeError, ValueError):
+            pass
+
+    # irregular input; let numpy convert it or raise
+    return np.asarray(raw, dtype=np.float32)
+
+
+def _nested_shape(raw):
+    shape = [ ]
+
+    probe = raw
+    while isinstance(probe, (list, tuple)):
+        shape.append(len(probe))
+
+        if len(probe) == 0:
+            break
+
+        probe = probe[0]
+
+    level = [ raw ]
+    for depth, length in enumerate(shape):
+        try:
+            if any(len(x) != length for x in level):
+                return None
+        except TypeError:
+            return None
+
+        if depth + 1 < len(shape):
+            level = list(chain.from_iterable(level))
+
+    return shape
+
+
+def reshape_vertices(input, color=None, out=None):
+    """
+    Pad (..., dimension) vertices out to (..., 8) float32 vertices, filling
+    z and w with 1 and the last four lanes with color.  8-wide input is
+    returned as is unless out, a preallocated C-contiguous float32 array of
+    the padded shape, is given to write the result into.
+    """
+
+    if input.ndim not in (2, 3):
         raise RuntimeError(
             'input must have shape of length 2 or 3',
-            { 'shape' : shape }
+            { 'shape' : list(input.shape) }
         )
 
-    valid = (2, 3, 4, 8)
-    if dimension not in valid:
+    dimension = input.shape[-1]
+    reshape = _SPECIALIZATIONS.get((input.ndim, dimension))
+
+    if reshape is None:
         raise RuntimeError(
             'invalid input dimension',
-            { 'dimension' : dimension, 'valid' : valid }
+            { 'dimension' : dimension, 'valid' : _VALID_DIMENSIONS }
         )
 
+    shape = input.shape[:-1] + (8,)
+
+    if out is None:
+        if dimension == 8:
+            return input
+
+        # every lane is written by the specialization, so skip
+        # zero-initialization
+        out = np.empty(shape=shape, dtype=np.float32)
+    elif out.shape != shape:
+        raise RuntimeError(
+            'output has wrong shape',
+            { 'shape' : list(out.shape), 'expected' : list(shape) }
+        )
+    elif not out.flags.c_contiguous:
+        raise RuntimeError('output must be C-contiguous')
+
+    reshape(input, _vertex_template(color)[dimension:], out)
+    return out
+
+
+# reshape_vertices is specialized for each (ndim, dimension) pair at import
+# time.  Each specialization takes the input, the tail of the color's vertex
+# template that pads it out to 8 lanes and the output to write.  With numba,
+# a kernel compiled for the pair does the writes, cached on disk (numba keys
+# the cache on the captured dimension too); failing that, the _fast
+# extension's kernels when it's built, which are no faster than numba's;
+# otherwise two NumPy copies with literal slices, one of the input and one
+# broadcast of the tail.
+
+_VALID_DIMENSIONS = (2, 3, 4, 8)
+
+_NUMPY_TEMPLATE = """
+def reshape(input, tail, out):
+    np.copyto(out[{axes}:{dimension}], input)
+
+    padding = out[{axes}{dimension}:]
+    np.copyto(padding, np.broadcast_to(tail, padding.shape))
+"""
+
+def _copy(input, tail, out):
+    np.copyto(out, input)
+
+
+def _make_pad_vertices_2d(dimension):
+    # dimension is a constant to numba, so each kernel's lane loops are
+    # unrolled into straight-line stores
+    def pad_vertices(input, tail, out):
+        for i in range(input.shape[0]):
+            for lane in range(dimension):
+                out[i, lane] = input[i, lane]
+
+            for lane in range(dimension, 8):
+                out[i, lane] = tail[lane - dimension]
+
+    return numba.njit(cache=True)(pad_vertices)
+
+
+def _make_pad_vertices_3d(dimension):
+    def pad_vertices(input, tail, out):
+        for i in range(input.shape[0]):
+            for j in range(input.shape[1]):
+                for lane in range(dimension):
+                    out[i, j, lane] = input[i, j, lane]
+
+                for lane in range(dimension, 8):
+                    out[i, j, lane] = tail[lane - dimension]
+
+    return numba.njit(cache=True)(pad_vertices)
+
+
+def _kernel_reshape(kernel):
+    # the compiled kernels are called with float32 input only, which keeps
+    # the number of signatures they're compiled for down
+    def reshape(input, tail, out):
+        kernel(np.asarray(input, dtype=np.float32), tail, out)
+
+    return reshape
+
+
+def _generate_reshape(ndim, dimension):
     if dimension == 8:
-        return input
+        return _copy
 
-    out = np.zeros(shape=shape, dtype=np.float32)
-    out[slice_to(dimension)] = input
+    if numba is not None:
+        make_kernel = _make_pad_vertices_2d if ndim == 2 else _make_pad_vertices_3d
+        return _kernel_reshape(make_kernel(dimension))
 
-    if dimension < 3:
-        out[slice_at(2)] = 1
+    if _fast is not None:
+        return _kernel_reshape(_fast.pad_vertices_2d if ndim == 2 else _fast.pad_vertices_3d)
 
-    if dimension < 4:
-        out[slice_at(3)] = 1
+    axes = ':, ' * (ndim - 1)
+    source = _NUMPY_TEMPLATE.format(axes=axes, dimension=dimension)
 
-    out[slice_from(4)] = color_to_float(color)
+    namespace = { 'np' : np }
+    exec(source, namespace)
+    return namespace['reshape']
 
-    return out
+
+_SPECIALIZATIONS = {
+    (ndim, dimension) : _generate_reshape(ndim, dimension)
+    for ndim in (2, 3)
+    for dimension in _VALID_DIMENSIONS
+}
@@ -0,0 +1,100 @@
+from io import StringIO
+
+import numpy as np
+
+
+def test_circle():
+    from sweatervest.circle import Circle
+    from sweatervest.util import jsonable_to_ndarray
+
+    circle = Circle({ 'center' : [ 1, 2 ], 'radius' : 3, 'color' : '#f00' })
+
+    assert circle.center.tolist() == [ 1, 2, 1, 1 ]
+    assert circle.radius == 3
+    assert circle.color.tolist() == [ 1, 0, 0, 1 ]
+
+    out = circle.convert_to_dict()
+    assert out['__class__'] == 'Circle'
+    assert out['radius'] == 3
+    assert jsonable_to_ndarray(out['color']).tolist() == [ 1, 0, 0, 1 ]
+    assert jsonable_to_ndarray(out['center']).tolist() == [ 1, 2, 1, 1 ]
+
+
+def test_scene_circle_batch():
+    from sweatervest.parser import parse_scene
+
+    scene = parse_scene(StringIO('''
+        __class__ : Scene
+        canvas : { extents : [ 512, 512 ] }
+        top :
+            __class__ : Group
+            children :
+                - { __class__ : Circle, center : [ 0, 0 ], radius : 1 }
+                - { __class__ : Circle, center : [ 4, 4, 2 ], radius : 2, color : '#00f' }
+    '''))
+
+    first, second = scene.data['top'].children
+    batch = scene.circles
+
+    assert first.batch is batch and first.index == 0
+    assert second.batch is batch and second.index == 1
+
+    assert batch.centers.tolist() == [ [ 0, 0, 1, 1 ], [ 4, 4, 2, 1 ] ]
+    assert batch.radii.tolist() == [ 1, 2 ]
+    assert batch.colors.tolist() == [ [ 0, 0, 0, 0 ], [ 0, 0, 1, 1 ] ]
+
+    point = np.array([ 3, 3, 2, 1 ], dtype=np.float32)
+    hits = np.sum((point - batch.centers) ** 2, axis=1) <= batch.radii ** 2
+    assert hits.tolist() == [ False, True ]
+
+
+def test_convert_position():
+    from sweatervest.circle import convert_position
+
+    tests = [
+        ([ ],                   [ 0, 0, 1, 1 ]),
+        ([ 5 ],                 [ 5, 0, 1, 1 ]),
+        ((5, 6, 7),             [ 5, 6, 7, 1 ]),
+        ([ 5, 6, 7, 8, 9 ],     [ 5, 6, 7, 8 ]),
+    ]
+
+    for input, expected in tests:
+        assert convert_position(input).tolist() == expected
+
+    out = np.zeros((2, 4), dtype=np.float32)
+    assert convert_position(np.array([ 3, 4 ]), out[1]).base is out
+    assert out.tolist() == [ [ 0, 0, 0, 0 ], [ 3, 4, 1, 1 ] ]
+
+
+def test_circle_requires_center_and_radius():
+    import pytest
+    from sweatervest.circle import Circle
+
+    for data in ({ 'center' : [ 0, 0 ] }, { 'radius' : 1 }):
+        with pytest.raises(KeyError):
+            Circle(data)
+
+
+def test_scene_ignores_arrays():
+    from sweatervest.circle import Circle
+    from sweatervest.scene import Scene, iter_objects
+
+    circle = Circle({ 'center' : [ 0, 0 ], 'radius' : 1 })
+    data = {
+        'top'       : [ circle ],
+        'transform' : np.eye(4, dtype=np.float32),
+        'scale'     : np.float32(2),
+    }
+
+    assert list(iter_objects(data)) == [ circle ]
+    assert Scene(data).circles.circles == [ circle ]
+
+
+def test_circle_radius_round_trip():
+    from sweatervest.circle import Circle
+
+    circle = Circle({ 'center' : [ 0, 0 ], 'radius' : 0.1 })
+
+    assert circle.radius == 0.1
+    assert circle.convert_to_dict()['radius'] == 0.1
+    assert circle.get_batch().radii.tolist() == [ np.float32(0.1) ]
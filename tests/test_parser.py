@@ -1,4 +1,6 @@
 from pathlib import Path
+
+import numpy as np
 import sweatervest
 
 def test_parse_scene():
@@ -7,3 +9,114 @@ def test_parse_scene():
     path = Path(__file__).parent / 'data' / 'test_scene.yaml'
     scene = parse_scene(str(path))
     assert isinstance(scene, sweatervest.scene.Scene)
+
+    mesh, = scene.data['top'].children
+    assert mesh.vertices.shape == (2, 2, 8)
+    assert scene.ranges[mesh] == (0, 4)
+    assert (scene.vertex_buffer.reshape(2, 2, 8) == mesh.vertices).all()
+
+
+def test_parse_scene_vertex_buffer():
+    from io import StringIO
+    from sweatervest.parser import parse_scene
+
+    scene = parse_scene(StringIO('''
+        __class__ : Scene
+        canvas : { extents : [ 512, 512 ] }
+        top :
+            __class__ : Group
+            children :
+                - { __class__ : ConvexPolygon, color : '#f00', vertices : [ [ 0, 0 ], [ 1, 0 ], [ 1, 1 ] ] }
+                - { __class__ : ConvexPolygon, color : '#f00', vertices : [ [ 2, 2 ], [ 3, 2 ], [ 3, 3 ] ] }
+                - { __class__ : ConvexPolygon, color : '#00f', vertices : [ [ 4, 4, 2 ] ] }
+    '''))
+
+    first, second, third = scene.data['top'].children
+
+    assert scene.vertex_buffer.shape == (7, 8)
+    assert scene.ranges[first] == (0, 3)
+    assert scene.ranges[second] == (3, 6)
+    assert scene.ranges[third] == (6, 7)
+
+    for primitive in (first, second, third):
+        assert primitive.vertices.base is scene.vertex_buffer
+        assert primitive.data['vertices'].base is scene.vertex_buffer
+
+    assert first.vertices.tolist() == [
+        [ 0, 0, 1, 1, 1, 0, 0, 1 ],
+        [ 1, 0, 1, 1, 1, 0, 0, 1 ],
+        [ 1, 1, 1, 1, 1, 0, 0, 1 ],
+    ]
+    assert second.vertices[0].tolist() == [ 2, 2, 1, 1, 1, 0, 0, 1 ]
+    assert third.vertices.tolist() == [ [ 4, 4, 2, 1, 0, 0, 1, 1 ] ]
+
+
+def test_batch_vertices_color_types():
+    from io import StringIO
+    from sweatervest.parser import parse_scene
+
+    # equal int and float components must not share a bucket: ints are
+    # 0-255 and floats 0-1
+    scene = parse_scene(StringIO('''
+        __class__ : Scene
+        canvas : { extents : [ 512, 512 ] }
+        top :
+            __class__ : Group
+            children :
+                - { __class__ : ConvexPolygon, color : [ 1, 0, 0, 1 ], vertices : [ [ 0, 0 ] ] }
+                - { __class__ : ConvexPolygon, color : [ 1., 0., 0., 1. ], vertices : [ [ 0, 0 ] ] }
+    '''))
+
+    int_color, float_color = scene.data['top'].children
+
+    assert int_color.vertices[0, 4:].tolist() == [ np.float32(1 / 255.), 0, 0, np.float32(1 / 255.) ]
+    assert float_color.vertices[0, 4:].tolist() == [ 1, 0, 0, 1 ]
+
+
+def test_scene_round_trip():
+    from io import StringIO
+    import yaml
+    from sweatervest.parser import parse_scene
+
+    path = Path(__file__).parent / 'data' / 'test_scene.yaml'
+    scene = parse_scene(str(path))
+
+    dumped = yaml.safe_dump(scene.convert_to_dict())
+    round_tripped = parse_scene(StringIO(dumped))
+
+    group, original = round_tripped.data['top'], scene.data['top']
+    assert (group.xform == original.xform).all()
+
+    mesh, = group.children
+    assert mesh.vertices.dtype == original.children[0].vertices.dtype
+    assert (mesh.vertices == original.children[0].vertices).all()
+    assert (round_tripped.vertex_buffer == scene.vertex_buffer).all()
+
+
+def test_batch_vertices_shared_buffer():
+    from sweatervest.parser import batch_vertices
+    from sweatervest.util import ndarray_to_jsonable
+
+    padded = np.arange(16, dtype=np.float32).reshape(2, 8)
+
+    parsed = {
+        'children' : [
+            { '__class__' : 'ConvexPolygon', 'vertices' : [ [ 0, 0 ], [ 1, 1 ] ] },
+            { '__class__' : 'MicropolygonMesh', 'vertices' : [ [ [ 0, 0, 0 ] ] * 2 ] * 3 },
+            { '__class__' : 'LinePath', 'vertices' : padded },
+            { '__class__' : 'ConvexPolygon', 'vertices' : ndarray_to_jsonable(padded) },
+        ],
+    }
+
+    buffer = batch_vertices(parsed)
+    assert buffer.shape == (12, 8)
+
+    polygon, mesh, path, decoded = parsed['children']
+    for item in parsed['children']:
+        assert item['vertices'].base is buffer
+
+    assert polygon['vertices'].tolist() == [ [ 0, 0, 1, 1, 0, 0, 0, 0 ], [ 1, 1, 1, 1, 0, 0, 0, 0 ] ]
+    assert mesh['vertices'].shape == (3, 2, 8)
+    assert (mesh['vertices'][..., 3] == 1).all()
+    assert (path['vertices'] == padded).all()
+    assert (decoded['vertices'] == padded).all()
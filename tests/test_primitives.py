@@ -0,0 +1,50 @@
+import numpy as np
+
+
+def test_primitives_keep_padded_vertices():
+    from sweatervest import ConvexPolygon, CubicHermitePath, LinePath, MicropolygonMesh
+
+    for cls, shape in (
+        (ConvexPolygon,    (3, 8)),
+        (CubicHermitePath, (4, 8)),
+        (LinePath,         (2, 8)),
+        (MicropolygonMesh, (2, 2, 8)),
+    ):
+        vertices = np.zeros(shape, dtype=np.float32)
+        assert cls({ 'vertices' : vertices }).vertices is vertices
+
+
+def test_primitives_pad_vertices():
+    from sweatervest import ConvexPolygon, CubicHermitePath, LinePath, MicropolygonMesh
+
+    for cls in (ConvexPolygon, CubicHermitePath, LinePath):
+        primitive = cls({ 'vertices' : [ [ 1, 2 ] ], 'color' : '#fff' })
+        assert primitive.vertices.tolist() == [ [ 1, 2, 1, 1, 1, 1, 1, 1 ] ]
+
+    mesh = MicropolygonMesh({ 'vertices' : [ [ [ 1, 2, 3, 4 ] ] ] })
+    assert mesh.vertices.tolist() == [ [ [ 1, 2, 3, 4, 0, 0, 0, 0 ] ] ]
+
+
+def test_scene_consolidates_vertices():
+    from sweatervest import ConvexPolygon, Group, MicropolygonMesh, Scene
+
+    polygon = ConvexPolygon({ 'vertices' : [ [ 1, 2 ], [ 3, 4 ] ] })
+    mesh = MicropolygonMesh({ 'vertices' : np.zeros((2, 3, 8), dtype=np.float32) })
+    original = polygon.vertices
+
+    scene = Scene({ 'top' : Group({ 'children' : [ polygon, mesh ] }) })
+
+    assert scene.vertex_buffer.shape == (8, 8)
+    assert scene.ranges == { polygon : (0, 2), mesh : (2, 8) }
+
+    for primitive in (polygon, mesh):
+        assert primitive.vertices.base is scene.vertex_buffer
+        assert primitive.data['vertices'] is primitive.vertices
+
+    assert (polygon.vertices == original).all()
+    assert mesh.vertices.shape == (2, 3, 8)
+
+    # already consolidated vertices are adopted rather than copied again
+    again = Scene({ 'top' : Group({ 'children' : [ mesh, polygon ] }) })
+    assert again.vertex_buffer is scene.vertex_buffer
+    assert again.ranges == scene.ranges
@@ -14,3 +14,273 @@ def test_parse_color():
 
     for input, expected in tests:
         assert parse_color(input) == expected
+
+
+def test_parse_color_invalid():
+    for input in ('', '#', '#ff', 'red', '#gggggg', '#ff00000', '#ééé', '##fff', 'fff '):
+        assert parse_color(input) is None
+
+
+def test_color_to_float():
+    from sweatervest.util import color_to_float
+
+    assert color_to_float(None) == (0., 0., 0., 0.)
+    assert color_to_float('#ff0000') == (1., 0., 0., 1.)
+    assert color_to_float('#ff0000') is color_to_float('#ff0000')
+    assert color_to_float((255, 0, 0.5, 1.)) == (1., 0., 0.5, 1.)
+
+
+def test_reshape_vertices():
+    import numpy as np
+    from sweatervest.util import reshape_vertices
+
+    color = (1., 0.5, 0.25, 1.)
+
+    tests = [
+        ([ [ 1, 2 ] ],             [ 1, 2, 1, 1 ]),
+        ([ [ 1, 2, 3 ] ],          [ 1, 2, 3, 1 ]),
+        ([ [ 1, 2, 3, 4 ] ],       [ 1, 2, 3, 4 ]),
+    ]
+
+    for input, expected in tests:
+        input = np.array(input, dtype=np.float32)
+        out = reshape_vertices(input, color)
+        assert out.shape == (1, 8)
+        assert out.dtype == np.float32
+        assert out.tolist() == [ expected + list(color) ]
+
+        out = reshape_vertices(input[np.newaxis], color)
+        assert out.shape == (1, 1, 8)
+        assert out.tolist() == [ [ expected + list(color) ] ]
+
+    input = np.arange(16, dtype=np.float32).reshape(2, 8)
+    assert reshape_vertices(input, color) is input
+
+
+def test_reshape_vertices_invalid():
+    import numpy as np
+    import pytest
+    from sweatervest.util import reshape_vertices
+
+    for shape in ((4,), (1, 5), (1, 1, 7), (1, 1, 1, 2)):
+        with pytest.raises(RuntimeError):
+            reshape_vertices(np.zeros(shape, dtype=np.float32))
+
+
+def test_vertices_to_f32():
+    import numpy as np
+    from sweatervest.util import _vertices_to_f32
+
+    tests = [
+        [ ],
+        [ [ 1, 2 ], [ 3, 4.5 ] ],
+        [ [ [ 1, 2, 3 ] ], [ [ 4, 5, 6 ] ] ],
+        ( ( 1, 2 ), ( 3, 4 ) ),
+    ]
+
+    for raw in tests:
+        out = _vertices_to_f32(raw)
+        expected = np.asarray(raw, dtype=np.float32)
+        assert out.dtype == np.float32
+        assert out.shape == expected.shape
+        assert (out == expected).all()
+
+    input = np.zeros((3, 8), dtype=np.float32)
+    assert _vertices_to_f32(input) is input
+    assert _vertices_to_f32(input.astype(np.float64)).dtype == np.float32
+
+
+def test_reshape_vertices_empty():
+    import numpy as np
+    from sweatervest.util import reshape_vertices
+
+    assert reshape_vertices(np.zeros((0, 2), dtype=np.float32), '#fff').shape == (0, 8)
+    assert reshape_vertices(np.zeros((0, 3, 4), dtype=np.float32), '#fff').shape == (0, 3, 8)
+
+
+def test_ndarray_to_jsonable():
+    import json
+    import numpy as np
+    from sweatervest.util import jsonable_to_ndarray, ndarray_to_jsonable
+
+    for input in (
+        np.arange(16, dtype=np.float32).reshape(2, 8),
+        np.arange(32, dtype=np.float32).reshape(2, 2, 8)[:, 1],
+        np.zeros((0, 8), dtype=np.float32),
+    ):
+        out = jsonable_to_ndarray(json.loads(json.dumps(ndarray_to_jsonable(input))))
+        assert out.dtype == input.dtype
+        assert out.shape == input.shape
+        assert (out == input).all()
+        assert out.flags.writeable
+
+
+def test_color_to_f32_array():
+    import numpy as np
+    from sweatervest.util import _color_to_f32_array
+
+    assert _color_to_f32_array(None).tolist() == [ 0, 0, 0, 0 ]
+    assert _color_to_f32_array(None) is _color_to_f32_array(None)
+    assert _color_to_f32_array('#f00').tolist() == [ 1, 0, 0, 1 ]
+    assert _color_to_f32_array([ 255, 0, 0, 255 ]).tolist() == [ 1, 0, 0, 1 ]
+    assert _color_to_f32_array([ 1., 0., 0., 1. ]).tolist() == [ 1, 0, 0, 1 ]
+    assert _color_to_f32_array((1, 0, 0, 1)).tolist() == [ 1 / np.float32(255), 0, 0, 1 / np.float32(255) ]
+    assert _color_to_f32_array(np.array([ .5, 0, 0, 1 ])).tolist() == [ .5, 0, 0, 1 ]
+    assert _color_to_f32_array([ 255, 0, 0, 255 ]) is _color_to_f32_array([ 255, 0, 0, 255 ])
+
+
+def test_reshape_vertices_out():
+    import numpy as np
+    import pytest
+    from sweatervest.util import reshape_vertices
+
+    out = np.full((4, 8), -1, dtype=np.float32)
+
+    assert reshape_vertices(np.zeros((2, 2), dtype=np.float32), '#fff', out=out[1:3]) is not None
+    assert out.tolist() == [
+        [ -1 ] * 8,
+        [ 0, 0, 1, 1, 1, 1, 1, 1 ],
+        [ 0, 0, 1, 1, 1, 1, 1, 1 ],
+        [ -1 ] * 8,
+    ]
+
+    input = np.ones((4, 8), dtype=np.float32)
+    assert reshape_vertices(input, out=out) is out
+    assert (out == input).all()
+
+    with pytest.raises(RuntimeError):
+        reshape_vertices(np.zeros((3, 2), dtype=np.float32), out=out)
+
+    with pytest.raises(RuntimeError):
+        reshape_vertices(np.zeros((4, 2), dtype=np.float32), out=np.empty((4, 16), dtype=np.float32)[:, ::2])
+
+
+def test_fast_kernels():
+    import numpy as np
+    import pytest
+
+    _fast = pytest.importorskip('sweatervest._fast')
+
+    assert _fast.parse_hex_color(b'#0000acac') == (0, 0, 172, 172)
+    assert _fast.parse_hex_color(b'7f00') == (119, 255, 0, 0)
+    assert _fast.parse_hex_color(b'#ggg') is None
+
+    tail = np.array([ 1, 1, .5, .5, .5, 1 ], dtype=np.float32)
+    out = np.empty((2, 8), dtype=np.float32)
+    _fast.pad_vertices_2d(np.array([ [ 1, 2 ], [ 3, 4 ] ], dtype=np.float32), tail, out)
+    assert out.tolist() == [ [ 1, 2, 1, 1, .5, .5, .5, 1 ], [ 3, 4, 1, 1, .5, .5, .5, 1 ] ]
+
+    tail = np.array([ 1, .5, .5, .5, 1 ], dtype=np.float32)
+    input = np.arange(12, dtype=np.float32).reshape(2, 2, 3)
+    out = np.empty((2, 2, 8), dtype=np.float32)
+    _fast.pad_vertices_3d(input, tail, out)
+    assert (out[..., :3] == input).all()
+    assert (out[..., 3:] == tail).all()
+
+    # strided input; out must be C-contiguous
+    wide = np.arange(24, dtype=np.float32).reshape(4, 6)
+    out = np.empty((4, 8), dtype=np.float32)
+    _fast.pad_vertices_2d(wide[:, ::2], tail, out)
+    assert out.tolist() == [ row[::2].tolist() + tail.tolist() for row in wide ]
+
+    with pytest.raises(ValueError):
+        _fast.pad_vertices_2d(wide[:, ::2], tail, np.empty((4, 16), dtype=np.float32)[:, ::2])
+
+
+def test_fast_specializations(monkeypatch):
+    import numpy as np
+    import pytest
+    from sweatervest import util
+
+    _fast = pytest.importorskip('sweatervest._fast')
+    assert util._fast is _fast
+
+    # numba takes priority; without it the specializations use _fast
+    monkeypatch.setattr(util, 'numba', None)
+
+    for ndim in (2, 3):
+        for dimension in (2, 3, 4):
+            reshape = util._generate_reshape(ndim, dimension)
+
+            shape = (3, 2, dimension)[3 - ndim:]
+            input = np.arange(np.prod(shape), dtype=np.float32).reshape(shape)
+            out = np.empty(shape[:-1] + (8,), dtype=np.float32)
+
+            reshape(input, util._vertex_template('#f00')[dimension:], out)
+            assert (out[..., :dimension] == input).all()
+            assert (out[..., dimension:4] == 1).all()
+            assert (out[..., 4:] == [ 1, 0, 0, 1 ]).all()
+
+    # float64 input is cast to float32 before reaching the kernel
+    out = np.empty((2, 8), dtype=np.float32)
+    util._generate_reshape(2, 2)(np.ones((2, 2)), util._vertex_template('#f00')[2:], out)
+    assert out.tolist() == [ [ 1, 1, 1, 1, 1, 0, 0, 1 ] ] * 2
+
+
+def test_reshape_backend_priority(monkeypatch):
+    import numpy as np
+    from types import SimpleNamespace
+    from sweatervest import util
+
+    calls = [ ]
+
+    def recorder(name):
+        def kernel(input, tail, out):
+            calls.append(name)
+
+        return kernel
+
+    fast = SimpleNamespace(pad_vertices_2d=recorder('_fast'), pad_vertices_3d=recorder('_fast'))
+    jit = SimpleNamespace(njit=lambda cache: lambda function: recorder('numba'))
+
+    input = np.zeros((1, 2), dtype=np.float32)
+    tail = util._vertex_template(None)[2:]
+
+    for fast_module, numba_module, expected in (
+        (fast, jit,  [ 'numba' ]),
+        (None, jit,  [ 'numba' ]),
+        (fast, None, [ '_fast' ]),
+        (None, None, [ ]),
+    ):
+        monkeypatch.setattr(util, '_fast', fast_module)
+        monkeypatch.setattr(util, 'numba', numba_module)
+
+        del calls[:]
+        out = np.zeros((1, 8), dtype=np.float32)
+        util._generate_reshape(2, 2)(input, tail, out)
+        assert calls == expected
+
+    # the NumPy fallback wrote the padding itself
+    assert out.tolist() == [ [ 0, 0, 1, 1, 0, 0, 0, 0 ] ]
+
+
+def test_color_key():
+    from sweatervest.util import _color_key
+
+    assert _color_key([ 1, 0, 0, 1 ]) == _color_key((1, 0, 0, 1))
+    assert _color_key([ 1, 0, 0, 1 ]) != _color_key([ 1., 0., 0., 1. ])
+    assert _color_key('#f00') != _color_key('#ff0000')
+    hash(_color_key([ 1, 0, 0, 1 ]))
+
+
+def test_numba_kernels():
+    import numpy as np
+    import pytest
+
+    pytest.importorskip('numba')
+    from sweatervest import util
+
+    for dimension in (2, 3, 4):
+        tail = util._vertex_template('#f00')[dimension:]
+
+        input = np.arange(5 * dimension, dtype=np.float32).reshape(5, dimension)
+        out = np.empty((5, 8), dtype=np.float32)
+        util._make_pad_vertices_2d(dimension)(input, tail, out)
+        assert (out[:, :dimension] == input).all()
+        assert (out[:, dimension:] == tail).all()
+
+        input = input.reshape(5, 1, dimension)
+        out = np.empty((5, 1, 8), dtype=np.float32)
+        util._make_pad_vertices_3d(dimension)(input, tail, out)
+        assert (out[..., :dimension] == input).all()
+        assert (out[..., dimension:] == tail).all()